@@ -0,0 +1,155 @@
+import argparse
+import time
+from collections import defaultdict
+from commons.utils.file_io import ingest_data
+from commons.utils.lexical_index import LexicalIndex, DEFAULT_INDEX_COLUMNS
+from commons.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+MATCH_TIERS = ["exact", "token", "fuzzy", "unresolved"]
+
+def load_queries(queries_file):
+    """
+    Reads queries from a text file, e.g. logged production lookups.
+
+    Each line holds a query, optionally followed by a tab and the comma-separated
+    document ids it should resolve to. Queries without ids only count towards coverage.
+
+    Returns:
+        list: (query, set of expected doc ids or None) pairs.
+    """
+    queries = []
+    with open(queries_file, encoding="utf-8") as f:
+        for line in f:
+            query, _, expected = line.rstrip("\n").partition("\t")
+            if query.strip():
+                queries.append((query.strip(), set(expected.split(",")) if expected else None))
+    return queries
+
+def name_variants(name):
+    """
+    Returns perturbed spellings of a catalog name, as a user might type it.
+
+    The variants are: punctuation and case changes, reversed word order, and a
+    dropped character (a typo).
+    """
+    variants = [name.upper().replace(" ", "-")]
+    words = name.split()
+    if len(words) > 1:
+        variants.append(" ".join(reversed(words)))
+    if len(name) > 6:
+        middle = len(name) // 2
+        variants.append(name[:middle] + name[middle + 1:])
+    return variants
+
+def perturbed_workload(df, columns=None):
+    """
+    Builds a labelled query workload from perturbed catalog names.
+
+    The index holds every catalog row. Each query is a perturbed name, or the
+    description of a row, and is labelled with that row's position. A
+    resolution is correct only if it returns that row.
+
+    Args:
+        df (pd.DataFrame): The catalog DataFrame.
+        columns (list, optional): Name columns. Defaults to DEFAULT_INDEX_COLUMNS.
+
+    Returns:
+        tuple: (LexicalIndex over the catalog, list of (query, expected doc ids) pairs).
+    """
+    columns = [col for col in (columns or DEFAULT_INDEX_COLUMNS) if col in df.columns]
+    index = LexicalIndex.build(df, columns)
+
+    queries = []
+    for position, row in enumerate(df.to_dict("records")):
+        expected = {str(position)}
+        for col in columns:
+            if isinstance(row.get(col), str):
+                queries.extend((variant, expected) for variant in name_variants(row[col]))
+        if isinstance(row.get("Description"), str):
+            queries.append((row["Description"], expected))
+    return index, queries
+
+def run_benchmark(index, queries, min_score=0.8):
+    """
+    Measures how many queries each match tier resolves, how many correctly, and how fast.
+
+    Args:
+        index (LexicalIndex): The index to benchmark.
+        queries (list): (query, set of expected doc ids or None) pairs.
+        min_score (float): Minimum score for token and fuzzy matches.
+
+    Returns:
+        dict: Per tier, the query count, correct resolutions, precision on labelled
+            queries and mean lookup time. Also the share of labelled queries that
+            skip model inference with a correct answer.
+    """
+    counts = defaultdict(int)
+    labelled = defaultdict(int)
+    correct = defaultdict(int)
+    seconds = defaultdict(float)
+    for query, expected in queries:
+        start = time.perf_counter()
+        matches = index.lookup(query, min_score)
+        elapsed = time.perf_counter() - start
+
+        tier = matches[0]["match"] if matches else "unresolved"
+        counts[tier] += 1
+        seconds[tier] += elapsed
+        if expected is not None:
+            labelled[tier] += 1
+            if matches and expected & {match["doc_id"] for match in matches}:
+                correct[tier] += 1
+
+    results = {
+        tier: {
+            "queries": counts[tier],
+            "correct": correct[tier],
+            "precision": correct[tier] / labelled[tier] if labelled[tier] else None,
+            "mean_lookup_us": seconds[tier] / counts[tier] * 1e6 if counts[tier] else 0.0,
+        }
+        for tier in MATCH_TIERS
+    }
+    total_labelled = sum(labelled.values())
+    results["correct_skip_ratio"] = (
+        sum(correct[tier] for tier in MATCH_TIERS[:-1]) / total_labelled if total_labelled else None
+    )
+
+    for tier in MATCH_TIERS:
+        tier_results = results[tier]
+        precision = "n/a" if tier_results["precision"] is None else f"{tier_results['precision']:.1%}"
+        if tier == "unresolved":
+            precision = "-"
+        logger.info(f"{tier}: {tier_results['queries']}/{len(queries)} queries, "
+                    f"{tier_results['correct']} correct (precision {precision}), "
+                    f"mean lookup {tier_results['mean_lookup_us']:.1f} us")
+    if results["correct_skip_ratio"] is not None:
+        logger.info(f"{results['correct_skip_ratio']:.1%} of labelled queries skip model inference with a correct answer")
+    else:
+        logger.info("No labelled queries; add expected doc ids to measure precision.")
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark for the lexical allergen name prefilter")
+    parser.add_argument("--queries_file", type=str, default=None, help="Queries, one per line, optionally followed by a tab and expected doc ids")
+    parser.add_argument("--index_path", type=str, default=None, help="Saved lexical index to query")
+    parser.add_argument("--file_path", type=str, default=None, help="Catalog file; used to build the index or the perturbed workload")
+    parser.add_argument("--min_score", type=float, default=0.8, help="Minimum score for token and fuzzy matches")
+    args = parser.parse_args()
+
+    if args.queries_file:
+        if args.index_path:
+            index = LexicalIndex.load(args.index_path)
+        elif args.file_path:
+            index = LexicalIndex.build(ingest_data(args.file_path))
+        else:
+            parser.error("--queries_file needs --index_path or --file_path")
+        queries = load_queries(args.queries_file)
+    elif args.file_path:
+        logger.warning("No queries file given; using perturbed catalog names, which are not production traffic.")
+        index, queries = perturbed_workload(ingest_data(args.file_path))
+    else:
+        parser.error("Provide --queries_file, or --file_path for a perturbed workload")
+
+    run_benchmark(index, queries, args.min_score)
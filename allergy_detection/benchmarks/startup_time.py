@@ -0,0 +1,88 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+from commons.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Step modules timed by the benchmark, keyed by MLproject entry point
+STEP_MODULES = {
+    "ingest": "src.ingestion.data_loader",
+    "select_features": "src.preprocessing.feature_extractor",
+    "preprocess": "src.preprocessing.cleaner",
+    "concatenate": "src.preprocessing.concatenator",
+    "transform": "src.transformation.transformer",
+    "reduce": "src.transformation.reducer",
+    "embeddings": "src.publishing.embeddings_publisher",
+}
+
+# Modules that must not be loaded just by importing a step
+HEAVY_MODULES = ["mlflow", "torch", "sentence_transformers", "pymongo"]
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "heavy": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+def measure_startup(module, repeats=3):
+    """
+    Measures the import time of a step module in fresh interpreters.
+
+    Args:
+        module (str): Dotted module path, relative to the allergy_detection directory.
+        repeats (int): Number of interpreter launches; the fastest one is reported.
+
+    Returns:
+        dict: Best import time in seconds and the heavy modules that were loaded.
+    """
+    best = None
+    env = dict(os.environ)
+    env.pop("MLFLOW_TRACKING_URI", None)  # Importing must not depend on tracking configuration
+    for _ in range(repeats):
+        output = subprocess.run(
+            [sys.executable, "-c", _PROBE.format(module=module, heavy=HEAVY_MODULES)],
+            cwd=PROJECT_DIR, env=env, capture_output=True, text=True, check=True,
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        if best is None or result["seconds"] < best["seconds"]:
+            best = result
+    return best
+
+def run_benchmark(max_seconds, repeats=3):
+    """
+    Times every step module and checks it against the startup budget.
+
+    Args:
+        max_seconds (float): Maximum allowed import time per step.
+        repeats (int): Number of interpreter launches per step.
+
+    Returns:
+        bool: True if every step is within budget and loads no heavy modules.
+    """
+    ok = True
+    for step, module in STEP_MODULES.items():
+        result = measure_startup(module, repeats)
+        logger.info(f"{step}: {result['seconds']:.3f}s, heavy modules loaded: {result['heavy'] or 'none'}")
+        if result["seconds"] > max_seconds:
+            logger.error(f"'{step}' startup took {result['seconds']:.3f}s (budget {max_seconds}s).")
+            ok = False
+        if result["heavy"]:
+            logger.error(f"'{step}' imports heavy modules at startup: {result['heavy']}")
+            ok = False
+    return ok
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Startup-time regression benchmark for pipeline steps")
+    parser.add_argument("--max_seconds", type=float, default=1.0, help="Maximum import time per step")
+    parser.add_argument("--repeats", type=int, default=3, help="Interpreter launches per step")
+    args = parser.parse_args()
+
+    if not run_benchmark(args.max_seconds, args.repeats):
+        sys.exit(1)
@@ -16,6 +16,11 @@ def main(args):
         parent_run_id = start_mlflow_run(experiment_name)
         logger.info(f"Parent Run ID: {parent_run_id}")
 
+        # Optional PCA reduction; the reduced vectors are published instead of the full ones
+        embeddings_path = args.embeddings_output_path
+        if args.n_components > 0:
+            embeddings_path = args.reduced_embeddings_path
+
         steps = [
             ("ingest", {"file_path": args.file_path}),
 
@@ -28,7 +33,9 @@ def main(args):
 
             ("preprocess", {
                 "file_path": args.selected_features_path,
-                "cleaned_data_path": args.cleaned_data_path
+                "cleaned_data_path": args.cleaned_data_path,
+                "index_path": args.lexical_index_path,
+                "catalog_path": args.file_path
             }),
 
 
@@ -45,7 +52,7 @@ def main(args):
               }),
 
             ("embeddings", {
-                "file_path": args.embeddings_output_path,
+                "file_path": embeddings_path,
                 "mongo_uri": args.mongo_uri, 
                 "database": args.database,
                 "collection": args.collection, 
@@ -53,6 +60,15 @@ def main(args):
             })
         ]
 
+        if args.n_components > 0:
+            steps.insert(-1, ("reduce", {
+                "file_path": args.embeddings_output_path,
+                "output_path": args.reduced_embeddings_path,
+                "projection_path": args.projection_path,
+                "n_components": args.n_components,
+                "whiten": args.whiten
+            }))
+
         for step_name, params in steps:
             logger.info(f"Starting '{step_name}' step...")
             try:
@@ -78,6 +94,7 @@ if __name__ == "__main__":
 
     # preprocess
     parser.add_argument('--cleaned_data_path', type=str, required=True)
+    parser.add_argument('--lexical_index_path', type=str, default="data/lexical_index.json")
 
     # feature selection
     parser.add_argument('--selected_columns', type=str, required=True)
@@ -90,6 +107,12 @@ if __name__ == "__main__":
     parser.add_argument('--embeddings_output_path', type=str, required=True)
     parser.add_argument('--model_name', type=str, required=True)
 
+    #reduce (optional, disabled when n_components is 0)
+    parser.add_argument('--n_components', type=int, default=0)
+    parser.add_argument('--reduced_embeddings_path', type=str, default="data/reduced_embeddings.csv")
+    parser.add_argument('--projection_path', type=str, default="data/projection.npz")
+    parser.add_argument('--whiten', type=str, default="false")
+
     #embeddings
     parser.add_argument('--mongo_uri', type=str, required=True)
     parser.add_argument('--database', type=str, required=True)
@@ -4,18 +4,23 @@ from commons.utils.file_io import ingest_data
 logger = setup_logger(__name__)
 
 # This function now simply calls the common ingest_data function
-def load_data(file_path):
+def load_data(file_path, max_workers=None, exclude=None):
     """
     Loads data using the common ingest_data utility.
 
     Args:
-        file_path (str): Path to the data file.
+        file_path (str): Path to the data file, a directory or a glob pattern.
+            Multiple files are read concurrently and tagged with their source.
+        max_workers (int, optional): Number of files read concurrently. None or 0
+            uses the number of CPUs.
+        exclude (list, optional): File name patterns to skip when file_path is a
+            directory or a glob, e.g. outputs written next to the source files.
 
     Returns:
         pd.DataFrame: The loaded DataFrame.
     """
     try:
-        df = ingest_data(file_path)
+        df = ingest_data(file_path, max_workers=max_workers or None, exclude=exclude)
         if df is not None:
             logger.info(f"Data loaded successfully with shape: {df.shape}")
         return df
@@ -28,7 +33,10 @@ if __name__ == "__main__":
     import argparse
 
     parser = argparse.ArgumentParser()
-    parser.add_argument('--file_path', type=str, required=True, help='Path to the data file')
+    parser.add_argument('--file_path', type=str, required=True, help='Path to the data file, a directory or a glob pattern')
+    parser.add_argument('--max_workers', type=int, default=None, help='Number of files read concurrently (0 for the number of CPUs)')
+    parser.add_argument('--exclude', type=str, default=None, help='Comma-separated file name patterns to skip in a directory or glob')
     args = parser.parse_args()
 
-    load_data(args.file_path)
\ No newline at end of file
+    exclude = [pattern.strip() for pattern in args.exclude.split(',')] if args.exclude else None
+    load_data(args.file_path, args.max_workers, exclude)
\ No newline at end of file
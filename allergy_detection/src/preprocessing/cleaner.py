@@ -1,35 +1,84 @@
 from commons.utils.logger import setup_logger
 from commons.utils.data_preprocessing import preprocess_data
+from commons.utils.file_io import ingest_data
+from commons.utils.lexical_index import LexicalIndex
+from commons.mlflow_utils.mlflow_manager import log_artifact, wait_for_artifact_uploads
 
 logger = setup_logger(__name__)
 
-def clean_data(df, preprocessed_data_path):
+def build_lexical_index(cleaned_df, catalog_path, index_path, source_rows):
+    """
+    Builds the lexical name index, saves it and logs it as an artifact.
+
+    The selected features may not include every name column, so the index is
+    built from the catalog rows that survived cleaning, in cleaned order. Row
+    positions therefore match the '_id' of the published embeddings.
+
+    Args:
+        cleaned_df (pd.DataFrame): The cleaned DataFrame, with its original row labels.
+        catalog_path (str): Path to the source catalog the features were selected from.
+            If None, the index is built from the columns of the cleaned data.
+        index_path (str): Path to save the index.
+        source_rows (int): Number of rows before cleaning; must match the catalog.
+
+    Returns:
+        LexicalIndex: The index, or None if the catalog does not line up with the data.
+
+    Raises:
+        RuntimeError: If uploading the index artifact failed.
+    """
+    if catalog_path:
+        catalog = ingest_data(catalog_path)
+        if len(catalog) != source_rows or not cleaned_df.index.isin(catalog.index).all():
+            logger.error("Catalog rows do not line up with the cleaned data. Lexical index not built.")
+            return None
+        index = LexicalIndex.build(catalog.loc[cleaned_df.index])
+    else:
+        index = LexicalIndex.build(cleaned_df)
+
+    index.save(index_path)
+    log_artifact(index_path)
+    wait_for_artifact_uploads()
+    return index
+
+def clean_data(df, preprocessed_data_path, index_path=None, catalog_path=None):
     """
     Cleans the data using the common preprocess_data utility.
 
     Args:
         df (pd.DataFrame): The DataFrame to clean.
         preprocessed_data_path (str): Path to save the cleaned data.
+        index_path (str, optional): Path to save the lexical name index. If None,
+            no index is built.
+        catalog_path (str, optional): Source catalog holding the name columns.
+            If None, the index is built from the columns of the cleaned data.
 
     Returns:
         pd.DataFrame: The cleaned DataFrame.
     """
     try:
+        source_rows = len(df)
         df = preprocess_data(df, preprocessed_data_path)
-        return df
     except Exception as e:
         logger.error(f"An error occurred during cleaning: {e}")
         return None
 
+    # The index is a required artifact, so its errors are not swallowed
+    if df is not None and index_path:
+        build_lexical_index(df, catalog_path, index_path, source_rows)
+
+    return df
+
 if __name__ == "__main__":
     import argparse
-    from commons.utils.file_io import ingest_data
 
     parser = argparse.ArgumentParser()
     parser.add_argument('--file_path', type=str, required=True, help='Path to the CSV file')
     parser.add_argument('--cleaned_data_path', type=str, required=True, help='Path to save cleaned data')
+    parser.add_argument('--index_path', type=str, default=None, help='Path to save the lexical name index')
+    parser.add_argument('--catalog_path', type=str, default=None, help='Source catalog with the name columns to index')
     args = parser.parse_args()
 
     df = ingest_data(args.file_path)
     if df is not None:
-        clean_data(df, args.cleaned_data_path)
\ No newline at end of file
+        clean_data(df, args.cleaned_data_path, args.index_path, args.catalog_path)
\ No newline at end of file
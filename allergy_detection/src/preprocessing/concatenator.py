@@ -3,7 +3,7 @@ import pandas as pd
 import logging
 import argparse
 from commons.utils.logger import setup_logger
-from commons.mlflow_utils.mlflow_manager import log_params, log_artifact
+from commons.mlflow_utils.mlflow_manager import log_params, log_artifact, wait_for_artifact_uploads
 
 # Set up logging
 logger = setup_logger(__name__)
@@ -15,6 +15,9 @@ def concatenate_columns(df, output_file):  # Changed to accept DataFrame directl
     Args:
         df (pd.DataFrame): The DataFrame to concatenate.
         output_file (str): Path to save the concatenated data.
+
+    Raises:
+        RuntimeError: If uploading the output artifact failed.
     """
     try:
         logger.info("Concatenating columns...")
@@ -35,6 +38,9 @@ def concatenate_columns(df, output_file):  # Changed to accept DataFrame directl
     except Exception as e:
         logger.error(f"Error during concatenation: {str(e)}")
 
+    # Outside the try block so a failed upload fails the step
+    wait_for_artifact_uploads()
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument('--file_path', type=str, required=True, help='Path to the input CSV file')
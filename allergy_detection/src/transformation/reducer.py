@@ -0,0 +1,105 @@
+import argparse
+import json
+import os
+import numpy as np
+from commons.utils.file_io import ingest_data
+from commons.utils.dimensionality_reduction import fit_projection, apply_projection, save_projection, retrieval_recall
+from commons.mlflow_utils.mlflow_manager import log_params, log_metrics, log_artifact, wait_for_artifact_uploads
+from commons.utils.logger import setup_logger
+
+# Initialize logger
+logger = setup_logger(__name__)
+
+def reduce_embeddings(file_path, output_path, projection_path, n_components=128, whiten=False, recall_k=10):
+    """
+    Fits a PCA projection on the catalog embeddings, applies it and saves the projection.
+
+    The projection is saved as a versioned artifact so query embeddings can be
+    projected the same way at search time (see apply_projection).
+
+    Args:
+        file_path (str): Path to the embeddings CSV file.
+        output_path (str): Path to save the reduced embeddings CSV file.
+        projection_path (str): Path to save the projection (.npz).
+        n_components (int): Number of output dimensions.
+        whiten (bool): Whether to whiten the projected components.
+        recall_k (int): Neighbours compared when measuring retrieval quality.
+
+    Returns:
+        pd.DataFrame: The DataFrame with reduced embeddings.
+
+    Raises:
+        RuntimeError: If uploading the projection or the reduced embeddings failed.
+    """
+    logger.info(f"Loading embeddings from {file_path}")
+    df = ingest_data(file_path)
+    if df is None or "embedding" not in df.columns:
+        logger.error("Failed to load embeddings data or missing 'embedding' column.")
+        raise ValueError("Failed to load embeddings data or missing 'embedding' column.")
+
+    embeddings = np.array(
+        [json.loads(value) if isinstance(value, str) else value for value in df["embedding"]],
+        dtype=np.float32,
+    )
+    logger.info(f"Loaded {embeddings.shape[0]} embeddings with {embeddings.shape[1]} dimensions.")
+
+    projection = fit_projection(embeddings, n_components, whiten=whiten)
+    reduced = apply_projection(embeddings, projection)
+
+    explained_variance = float(projection["explained_variance_ratio"].sum())
+    recall = retrieval_recall(embeddings, reduced, k=recall_k)
+    logger.info(f"Explained variance: {explained_variance:.4f}, recall@{recall_k} vs full dimensions: {recall:.4f}")
+
+    df["embedding"] = [vector.tolist() for vector in reduced]
+    df["projection_version"] = projection["version"]
+
+    directory = os.path.dirname(output_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    df.to_csv(output_path, index=False)
+    logger.info(f"Reduced embeddings saved to {output_path}")
+
+    save_projection(projection, projection_path)
+
+    # Log with MLflow
+    log_params({
+        "input_dims": embeddings.shape[1],
+        "n_components": n_components,
+        "whiten": whiten,
+        "projection_version": projection["version"],
+    })
+    log_metrics({
+        "explained_variance": explained_variance,
+        f"recall_at_{recall_k}": recall,
+    })
+    log_artifact(projection_path, f"projections/{projection['version']}")
+    log_artifact(output_path)
+
+    # Query-time projection depends on the stored projection; fail the step if an upload failed
+    wait_for_artifact_uploads()
+
+    return df
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--file_path", type=str, required=True, help="Path to the embeddings CSV file")
+    parser.add_argument("--output_path", type=str, required=True, help="Path to save the reduced embeddings CSV file")
+    parser.add_argument("--projection_path", type=str, required=True, help="Path to save the projection (.npz)")
+    parser.add_argument("--n_components", type=int, default=128, help="Number of output dimensions")
+    parser.add_argument("--whiten", type=str, default="false", help="Whiten the projected components (true/false)")
+
+    args = parser.parse_args()
+
+    logger.info("Starting the embedding reduction script.")
+    try:
+        reduce_embeddings(
+            args.file_path,
+            args.output_path,
+            args.projection_path,
+            args.n_components,
+            whiten=args.whiten.lower() == "true",
+        )
+        logger.info("Embedding reduction script completed successfully.")
+    except Exception as e:
+        logger.error(f"An error occurred: {e}")
+        raise
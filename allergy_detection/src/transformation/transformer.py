@@ -1,10 +1,7 @@
 import argparse
 import pandas as pd
-import mlflow
-import mlflow.sentence_transformers
-from sentence_transformers import SentenceTransformer
 from commons.utils.file_io import ingest_data
-from commons.mlflow_utils.mlflow_manager import log_params
+from commons.mlflow_utils.mlflow_manager import get_mlflow, log_params, log_artifact, wait_for_artifact_uploads
 from commons.utils.logger import setup_logger
 
 # Initialize logger
@@ -19,6 +16,12 @@ def generate_embeddings(file_path, output_path, model_name="allergy_detection"):
         output_path (str): Path to save the embeddings CSV file.
         model_name (str): SentenceTransformer model name.
     """
+    # Heavy dependencies (mlflow, torch) are imported only when embeddings are generated
+    import mlflow.sentence_transformers
+    from sentence_transformers import SentenceTransformer
+
+    mlflow = get_mlflow()
+
     logger.info("Starting MLflow run for generating embeddings.")
     with mlflow.start_run():  # Start an MLflow run
 
@@ -45,7 +48,7 @@ def generate_embeddings(file_path, output_path, model_name="allergy_detection"):
         df.to_csv(output_path, index=False)
         logger.info("Embeddings saved successfully.")
         
-        mlflow.log_artifact(output_path)  # Log to MLflow
+        log_artifact(output_path)  # Uploaded in the background, skipped if unchanged
         logger.info("Embeddings logged to MLflow.")
 
         # Log the SentenceTransformer model to MLflow
@@ -58,6 +61,9 @@ def generate_embeddings(file_path, output_path, model_name="allergy_detection"):
         # Log run parameters
         log_params({"file_path": file_path, "output_path": output_path, "model_name": model_name})
         logger.info("Run parameters logged to MLflow.")
+
+        # Finish pending uploads before the run is closed; fails the step if an upload failed
+        wait_for_artifact_uploads()
         
         logger.info("MLflow run completed successfully.")
 
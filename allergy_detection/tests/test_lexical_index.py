@@ -0,0 +1,117 @@
+import pytest
+from commons.utils.lexical_index import LexicalIndex
+
+def make_index(names):
+    index = LexicalIndex()
+    for doc_id, name in enumerate(names):
+        index.add(name, str(doc_id), "Allergen")
+    return index
+
+def test_exact_match_ignores_case_and_punctuation():
+    index = make_index(["gold kiwifruit", "nsLTP1"])
+
+    matches = index.lookup("Gold  Kiwifruit")
+
+    assert [(m["doc_id"], m["match"], m["score"]) for m in matches] == [("0", "exact", 1.0)]
+    assert index.lookup("NSLTP-1") == []  # "nsltp 1" is a different designation from "nsltp1"
+
+def test_token_match_covering_whole_name():
+    index = make_index(["gold kiwifruit"])
+
+    matches = index.lookup("kiwifruit, gold")
+
+    assert [(m["doc_id"], m["match"]) for m in matches] == [("0", "token")]
+    assert matches[0]["score"] < 1.0
+
+def test_partial_token_match_below_min_score_is_unresolved():
+    index = make_index(["green kiwi fruit", "cysteine protease actinidin"])
+
+    assert index.lookup("kiwi") == []
+    assert index.lookup("actinidin") == []
+
+def test_ambiguous_token_match_is_unresolved():
+    index = make_index(["ara h 1", "act d 1", "gal d 1"])
+
+    assert index.lookup("1") == []
+
+def test_fuzzy_match_on_typo():
+    index = make_index(["beta fructofuranosidase"])
+
+    matches = index.lookup("beta-fructorfuranosidase")
+
+    assert [(m["doc_id"], m["match"]) for m in matches] == [("0", "fuzzy")]
+    assert 0.8 <= matches[0]["score"] < 1.0
+
+@pytest.mark.parametrize("indexed, query", [
+    ("Ara h 1", "Ara h 10"),
+    ("Ara h 1", "Ara h 15"),
+    ("Gal d 1", "Gal d 10"),
+    ("Lit v 13", "Lit v 1"),
+    ("Pen m 13", "Pen m 1"),
+    ("7S globulin vicilin", "11S globulin vicilin"),
+    ("high molecular weight glutenin", "Low molecular weight glutenin"),
+    ("alpha-amylase inhibitor", "beta-amylase inhibitor"),
+    ("chitinase III", "chitinase"),
+])
+def test_designation_and_contrasting_token_mismatches_are_rejected(indexed, query):
+    index = make_index([indexed])
+
+    assert index.lookup(query) == []
+
+def test_resolve_splits_resolved_and_unresolved():
+    index = make_index(["ara h 1"])
+
+    resolved, unresolved = index.resolve(["Ara h 1", "Ara h 10", "peanut allergy symptoms"])
+
+    assert list(resolved) == ["Ara h 1"]
+    assert unresolved == ["Ara h 10", "peanut allergy symptoms"]
+
+def test_save_load_round_trip(tmp_path):
+    index = make_index(["gold kiwifruit", "ara h 1", "beta fructofuranosidase"])
+    index_path = str(tmp_path / "index" / "lexical_index.json")
+
+    index.save(index_path)
+    loaded = LexicalIndex.load(index_path)
+
+    for query in ["gold kiwifruit", "kiwifruit gold", "beta-fructorfuranosidase", "Ara h 10"]:
+        assert loaded.lookup(query) == index.lookup(query)
+
+def test_load_missing_file_raises(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        LexicalIndex.load(str(tmp_path / "missing.json"))
+
+def test_build_skips_missing_values_and_columns():
+    pd = pytest.importorskip("pandas")
+    df = pd.DataFrame({"Allergen": ["Ara h 1", None], "CommonName": ["peanut", "gold kiwifruit"]})
+
+    index = LexicalIndex.build(df)
+
+    assert [m["doc_id"] for m in index.lookup("gold kiwifruit")] == ["1"]
+    assert [m["field"] for m in index.lookup("ara h 1")] == ["Allergen"]
+
+def test_cleaner_index_ids_follow_cleaned_row_order(tmp_path, monkeypatch):
+    pd = pytest.importorskip("pandas")
+    from src.preprocessing import cleaner
+
+    monkeypatch.setattr(cleaner, "log_artifact", lambda *args, **kwargs: None)
+    monkeypatch.setattr(cleaner, "wait_for_artifact_uploads", lambda *args, **kwargs: None)
+
+    catalog = pd.DataFrame({
+        "Allergen": ["Act c 10", "Ara h 1", "Gal d 1"],
+        "BiochemicalName": ["nsLTP1", "vicilin", "ovomucoid"],
+        "CommonName": ["gold kiwifruit", None, "chicken"],
+    })
+    catalog_path = tmp_path / "catalog.csv"
+    catalog.to_csv(catalog_path, index=False)
+
+    selected = catalog[["Allergen", "CommonName"]]
+    cleaned = cleaner.clean_data(
+        selected, str(tmp_path / "cleaned.csv"), str(tmp_path / "index.json"), str(catalog_path)
+    )
+    index = LexicalIndex.load(str(tmp_path / "index.json"))
+
+    # The row without a CommonName is dropped, so "Gal d 1" is the second cleaned row
+    assert list(cleaned["Allergen"]) == ["Act c 10", "Gal d 1"]
+    assert [m["doc_id"] for m in index.lookup("Gal d 1")] == ["1"]
+    assert [m["doc_id"] for m in index.lookup("ovomucoid")] == ["1"]
+    assert index.lookup("vicilin") == []
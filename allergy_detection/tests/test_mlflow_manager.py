@@ -0,0 +1,98 @@
+import threading
+import types
+import pytest
+from commons.mlflow_utils import mlflow_manager
+
+class StubClient:
+    def __init__(self, state):
+        self.state = state
+
+    def log_artifact(self, run_id, local_path, artifact_folder=None):
+        self.state["upload_started"].set()
+        self.state["release_upload"].wait(timeout=5)
+        if self.state["fail_uploads"]:
+            raise IOError("upload failed")
+        self.state["uploads"].append((run_id, artifact_folder))
+
+    def set_tag(self, run_id, key, value):
+        self.state["tags"][key] = value
+
+@pytest.fixture
+def stub_mlflow(monkeypatch):
+    """Replaces mlflow with a stub and resets the manager's artifact state."""
+    state = {
+        "uploads": [],
+        "tags": {},
+        "searched_runs": [],
+        "fail_uploads": False,
+        "upload_started": threading.Event(),
+        "release_upload": threading.Event(),
+    }
+    state["release_upload"].set()
+    run = types.SimpleNamespace(info=types.SimpleNamespace(run_id="run-1", experiment_id="exp-1"))
+    stub = types.SimpleNamespace(
+        active_run=lambda: run,
+        start_run=lambda **kwargs: run,
+        MlflowClient=lambda: StubClient(state),
+        search_runs=lambda **kwargs: state["searched_runs"],
+        set_tag=lambda key, value: state["tags"].__setitem__(key, value),
+    )
+    monkeypatch.setattr(mlflow_manager, "_mlflow", stub)
+    monkeypatch.setattr(mlflow_manager, "_artifact_uploader", None)
+    monkeypatch.setattr(mlflow_manager, "_artifact_uris", {})
+    monkeypatch.setattr(mlflow_manager, "_pending_refs", {})
+    monkeypatch.setitem(mlflow_manager._artifact_settings, "asynchronous", True)
+    return state
+
+@pytest.fixture
+def artifact(tmp_path):
+    path = tmp_path / "output.csv"
+    path.write_text("a,b\n1,2\n")
+    return str(path)
+
+def test_matching_hash_is_referenced_not_uploaded(stub_mlflow, artifact):
+    digest = mlflow_manager.file_sha256(artifact)
+    existing_uri = "runs:/run-0/output.csv"
+    stub_mlflow["searched_runs"] = [
+        types.SimpleNamespace(data=types.SimpleNamespace(tags={f"artifact_sha256.{digest}": existing_uri}))
+    ]
+
+    mlflow_manager.log_artifact(artifact)
+    mlflow_manager.wait_for_artifact_uploads()
+
+    assert stub_mlflow["uploads"] == []
+    assert stub_mlflow["tags"] == {"artifact_ref.output.csv": existing_uri}
+
+def test_reference_queued_while_upload_in_flight(stub_mlflow, artifact):
+    stub_mlflow["release_upload"].clear()
+
+    mlflow_manager.log_artifact(artifact)
+    assert stub_mlflow["upload_started"].wait(timeout=5)
+    mlflow_manager.log_artifact(artifact)
+
+    # The reference is only tagged once the upload has succeeded
+    assert "artifact_ref.output.csv" not in stub_mlflow["tags"]
+    stub_mlflow["release_upload"].set()
+    mlflow_manager.wait_for_artifact_uploads()
+
+    assert stub_mlflow["uploads"] == [("run-1", None)]
+    assert stub_mlflow["tags"]["artifact_ref.output.csv"] == "runs:/run-1/output.csv"
+
+def test_failed_upload_surfaces_from_wait(stub_mlflow, artifact):
+    stub_mlflow["fail_uploads"] = True
+    stub_mlflow["release_upload"].clear()
+
+    mlflow_manager.log_artifact(artifact)
+    assert stub_mlflow["upload_started"].wait(timeout=5)
+    mlflow_manager.log_artifact(artifact)
+    stub_mlflow["release_upload"].set()
+
+    with pytest.raises(RuntimeError, match="1 artifact upload"):
+        mlflow_manager.wait_for_artifact_uploads()
+
+    # No tag points at the missing artifact, and a later call uploads again
+    assert stub_mlflow["tags"] == {}
+    stub_mlflow["fail_uploads"] = False
+    mlflow_manager.log_artifact(artifact)
+    mlflow_manager.wait_for_artifact_uploads()
+    assert stub_mlflow["uploads"] == [("run-1", None)]
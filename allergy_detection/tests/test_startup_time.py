@@ -0,0 +1,15 @@
+import pytest
+from benchmarks.startup_time import STEP_MODULES, measure_startup
+
+# The step modules need pandas; without it there is nothing to measure
+pytest.importorskip("pandas")
+
+# Generous budget so the test flags regressions (e.g. torch at import) rather than slow machines
+MAX_STARTUP_SECONDS = 5.0
+
+@pytest.mark.parametrize("step", ["ingest", "select_features", "preprocess"])
+def test_step_starts_without_heavy_imports(step):
+    result = measure_startup(STEP_MODULES[step], repeats=1)
+
+    assert result["heavy"] == []
+    assert result["seconds"] < MAX_STARTUP_SECONDS
@@ -1,10 +1,62 @@
-import mlflow
+import os
+import atexit
+import gzip
+import hashlib
+import queue
+import shutil
+import tempfile
+import threading
 from commons.utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
-# Set the tracking URI
-mlflow.set_tracking_uri("azureml://centralindia.api.azureml.ms/mlflow/v1.0/subscriptions/984f0ec9-e17c-43ae-a685-91c37732d7c4/resourceGroups/plevenn-plm-dev-reg/providers/Microsoft.MachineLearningServices/workspaces/ple-ml-dev-workspace")
+# Environment variable holding the tracking URI (e.g. the Azure ML workspace URI)
+TRACKING_URI_ENV = "MLFLOW_TRACKING_URI"
+
+# Run tag prefixes for content-addressed artifacts
+ARTIFACT_HASH_TAG = "artifact_sha256"
+ARTIFACT_REF_TAG = "artifact_ref"
+
+_mlflow = None
+_tracking_uri = None
+
+_artifact_settings = {"asynchronous": True, "compress": False, "max_queue_size": 8}
+_artifact_uploader = None
+_artifact_lock = threading.Lock()
+_artifact_uris = {}  # content hash -> URI of an artifact known to be stored
+_pending_refs = {}   # content hash -> [(run_id, name)] waiting on an upload in flight
+
+def configure_tracking(tracking_uri=None):
+    """
+    Sets the tracking URI used on the first MLflow call.
+
+    Args:
+        tracking_uri (str, optional): The tracking URI. If None, the value of the
+            MLFLOW_TRACKING_URI environment variable is used, falling back to
+            MLflow's local default.
+    """
+    global _tracking_uri
+    _tracking_uri = tracking_uri
+    if _mlflow is not None and tracking_uri:
+        _mlflow.set_tracking_uri(tracking_uri)
+
+def get_mlflow():
+    """
+    Imports mlflow and resolves the tracking URI on first use.
+
+    Returns:
+        module: The configured mlflow module.
+    """
+    global _mlflow
+    if _mlflow is None:
+        import mlflow
+
+        tracking_uri = _tracking_uri or os.environ.get(TRACKING_URI_ENV)
+        if tracking_uri:
+            mlflow.set_tracking_uri(tracking_uri)
+            logger.info(f"MLflow tracking URI set to: {tracking_uri}")
+        _mlflow = mlflow
+    return _mlflow
 
 def start_mlflow_run(experiment_name):
     """
@@ -17,6 +69,7 @@ def start_mlflow_run(experiment_name):
         str: The parent run ID.
     """
     try:
+        mlflow = get_mlflow()
         mlflow.set_experiment(experiment_name)
 
         if not mlflow.active_run():
@@ -31,6 +84,7 @@ def start_mlflow_run(experiment_name):
 
 def ensure_active_run():
     """Ensures that an MLflow run is active."""
+    mlflow = get_mlflow()
     if not mlflow.active_run():
         mlflow.start_run()
 
@@ -39,6 +93,8 @@ def end_mlflow_run():
     Ends the currently active MLflow run if one exists.
     """
     try:
+        mlflow = get_mlflow()
+        wait_for_artifact_uploads(raise_errors=False)
         if mlflow.active_run():
             mlflow.end_run()
             logger.info("MLflow parent run ended successfully.")
@@ -55,6 +111,7 @@ def run_mlflow_experiment(experiment_name, entry_point, parameters):
         parameters (dict): A dictionary of parameters to pass to the entry point.
     """
     try:
+        mlflow = get_mlflow()
         parent_run_id = start_mlflow_run(experiment_name)
 
         with mlflow.start_run(run_name=entry_point, nested=True):
@@ -70,6 +127,7 @@ def run_mlflow_experiment(experiment_name, entry_point, parameters):
 def log_params(params):
     """Logs model parameters to MLflow."""
     try:
+        mlflow = get_mlflow()
         ensure_active_run()
         for key, value in params.items():
             mlflow.log_param(key, value)
@@ -79,6 +137,7 @@ def log_params(params):
 def log_metrics(metrics):
     """Logs model metrics to MLflow."""
     try:
+        mlflow = get_mlflow()
         ensure_active_run()
         for key, value in metrics.items():
             mlflow.log_metric(key, value)
@@ -88,22 +147,221 @@ def log_metrics(metrics):
 def log_model(model, model_name):
     """Logs the model to MLflow."""
     try:
+        mlflow = get_mlflow()
         ensure_active_run()
         mlflow.sklearn.log_model(model, model_name)
     except Exception as e:
         logger.error(f"An error occurred while logging the model: {e}")
 
-def log_artifact(artifact_path, artifact_folder=None):
-    """Logs an artifact to MLflow."""
+def configure_artifact_uploads(asynchronous=True, compress=False, max_queue_size=8):
+    """
+    Configures how log_artifact uploads files.
+
+    Args:
+        asynchronous (bool): Upload on a background thread instead of blocking the caller.
+        compress (bool): Gzip files before uploading them.
+        max_queue_size (int): Maximum number of pending uploads; log_artifact blocks
+            when the queue is full. Takes effect before the first upload.
+    """
+    _artifact_settings.update(
+        asynchronous=asynchronous, compress=compress, max_queue_size=max_queue_size
+    )
+
+def file_sha256(file_path, chunk_size=1024 * 1024):
+    """Returns the SHA-256 hex digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+class ArtifactUploader:
+    def __init__(self, max_queue_size=8):
+        """Start a background thread that uploads artifacts from a bounded queue."""
+        self.queue = queue.Queue(maxsize=max_queue_size)
+        self.errors = []  # (artifact_path, exception) of failed uploads since the last wait
+        self.thread = threading.Thread(target=self._run, name="mlflow-artifact-uploader", daemon=True)
+        self.thread.start()
+
+    def submit(self, job):
+        """Queues an upload job, blocking while the queue is full."""
+        self.queue.put(job)
+
+    def wait(self):
+        """
+        Blocks until every queued upload has finished.
+
+        Returns:
+            list: (artifact_path, exception) for each upload that failed since the last wait.
+        """
+        self.queue.join()
+        errors, self.errors = self.errors, []
+        return errors
+
+    def _run(self):
+        while True:
+            job = self.queue.get()
+            try:
+                _upload_artifact(**job)
+            except Exception as e:
+                logger.error(f"An error occurred while uploading the artifact {job['artifact_path']}: {e}")
+                self.errors.append((job["artifact_path"], e))
+            finally:
+                self.queue.task_done()
+
+def _upload_artifact(run_id, artifact_path, local_path, artifact_folder, digest, artifact_uri, cleanup_dir):
+    """
+    Uploads a staged artifact file and tags the run with its content hash.
+
+    References requested while the upload was in flight are tagged only once it
+    has succeeded; on failure they are dropped so no tag points at a missing file.
+    """
     try:
+        client = get_mlflow().MlflowClient()
+        client.log_artifact(run_id, local_path, artifact_folder)
+        client.set_tag(run_id, f"{ARTIFACT_HASH_TAG}.{digest}", artifact_uri)
+        logger.info(f"Artifact uploaded: {artifact_uri}")
+    except Exception:
+        with _artifact_lock:
+            refs = _pending_refs.pop(digest, [])
+        if refs:
+            logger.error(f"Dropping {len(refs)} reference(s) to the failed upload {artifact_uri}")
+        raise
+    finally:
+        shutil.rmtree(cleanup_dir, ignore_errors=True)
+
+    with _artifact_lock:
+        _artifact_uris[digest] = artifact_uri
+        refs = _pending_refs.pop(digest, [])
+    for ref_run_id, name in refs:
+        client.set_tag(ref_run_id, f"{ARTIFACT_REF_TAG}.{name}", artifact_uri)
+
+def wait_for_artifact_uploads(raise_errors=True):
+    """
+    Blocks until all background artifact uploads have finished.
+
+    Args:
+        raise_errors (bool): Raise if any upload failed; otherwise only log it.
+
+    Raises:
+        RuntimeError: If an upload failed since the last wait and raise_errors is True.
+    """
+    if _artifact_uploader is None:
+        return
+
+    errors = _artifact_uploader.wait()
+    if errors:
+        message = f"{len(errors)} artifact upload(s) failed: " + ", ".join(
+            f"{path} ({error})" for path, error in errors
+        )
+        if raise_errors:
+            raise RuntimeError(message) from errors[0][1]
+        logger.error(message)
+
+def _get_artifact_uploader():
+    global _artifact_uploader
+    if _artifact_uploader is None:
+        _artifact_uploader = ArtifactUploader(_artifact_settings["max_queue_size"])
+        atexit.register(wait_for_artifact_uploads, raise_errors=False)  # Don't lose uploads when the step exits
+    return _artifact_uploader
+
+def _find_artifact(mlflow, experiment_id, digest):
+    """Returns the URI of an artifact with the given content hash in the experiment, if any."""
+    with _artifact_lock:
+        if digest in _artifact_uris:
+            return _artifact_uris[digest]
+
+    tag = f"{ARTIFACT_HASH_TAG}.{digest}"
+    try:
+        runs = mlflow.search_runs(
+            experiment_ids=[experiment_id],
+            filter_string=f"tags.`{tag}` LIKE '%'",
+            max_results=1,
+            output_format="list",
+        )
+    except Exception as e:
+        logger.warning(f"Could not search for existing artifacts, uploading instead: {e}")
+        return None
+    if runs:
+        with _artifact_lock:
+            _artifact_uris[digest] = runs[0].data.tags[tag]
+        return runs[0].data.tags[tag]
+    return None
+
+def log_artifact(artifact_path, artifact_folder=None, compress=None):
+    """
+    Logs an artifact to MLflow, skipping files already stored in the experiment.
+
+    The file is hashed; if an artifact with the same content was logged before,
+    the run is tagged with a reference to it instead of uploading again. If the
+    same content is still being uploaded, the reference is tagged once that
+    upload succeeds. Otherwise the file is staged and uploaded, on the
+    background uploader unless asynchronous uploads are disabled (see
+    configure_artifact_uploads). Call wait_for_artifact_uploads to surface
+    background upload failures.
+
+    Args:
+        artifact_path (str): Path to the local file.
+        artifact_folder (str, optional): Folder within the run's artifact directory.
+        compress (bool, optional): Gzip the file before uploading. Defaults to the
+            configured setting.
+    """
+    try:
+        mlflow = get_mlflow()
         ensure_active_run()
-        mlflow.log_artifact(artifact_path, artifact_folder)
+        run = mlflow.active_run()
+        name = os.path.basename(artifact_path)
+        digest = file_sha256(artifact_path)
+
+        with _artifact_lock:
+            if digest in _pending_refs:
+                _pending_refs[digest].append((run.info.run_id, name))
+                logger.info(f"Artifact {artifact_path} is already being uploaded; reference queued.")
+                return
+
+        existing_uri = _find_artifact(mlflow, run.info.experiment_id, digest)
+        if existing_uri:
+            mlflow.set_tag(f"{ARTIFACT_REF_TAG}.{name}", existing_uri)
+            logger.info(f"Artifact {artifact_path} unchanged; referencing {existing_uri}")
+            return
+
+        # Stage a copy so the upload is not affected by later writes to the file
+        compress = _artifact_settings["compress"] if compress is None else compress
+        cleanup_dir = tempfile.mkdtemp(prefix="mlflow_artifact_")
+        if compress:
+            name = f"{name}.gz"
+            local_path = os.path.join(cleanup_dir, name)
+            with open(artifact_path, "rb") as src, gzip.open(local_path, "wb") as dst:
+                shutil.copyfileobj(src, dst)
+        else:
+            local_path = os.path.join(cleanup_dir, name)
+            shutil.copyfile(artifact_path, local_path)
+
+        artifact_uri = f"runs:/{run.info.run_id}/{artifact_folder + '/' if artifact_folder else ''}{name}"
+        with _artifact_lock:
+            _pending_refs[digest] = []
+        job = {
+            "run_id": run.info.run_id,
+            "artifact_path": artifact_path,
+            "local_path": local_path,
+            "artifact_folder": artifact_folder,
+            "digest": digest,
+            "artifact_uri": artifact_uri,
+            "cleanup_dir": cleanup_dir,
+        }
+
+        if _artifact_settings["asynchronous"]:
+            _get_artifact_uploader().submit(job)
+            logger.info(f"Artifact {artifact_path} queued for upload.")
+        else:
+            _upload_artifact(**job)
     except Exception as e:
         logger.error(f"An error occurred while logging the artifact: {e}")
 
 def register_model(model_registry_name, model_name, model_uri):
     """Registers the model in MLflow."""
     try:
+        mlflow = get_mlflow()
         current_run_id = get_current_run_id()
         if current_run_id is None:
             logger.error("No active MLflow run found. Cannot register the model.")
@@ -118,6 +376,7 @@ def register_model(model_registry_name, model_name, model_uri):
 def get_current_run_id():
     """Returns the ID of the currently active MLflow run."""
     try:
+        mlflow = get_mlflow()
         active_run = mlflow.active_run()
         run_id = active_run.info.run_id if active_run else None
         logger.info(f"Current active run ID: {run_id}")
@@ -0,0 +1,166 @@
+import hashlib
+import os
+import numpy as np
+from commons.utils.logger import setup_logger
+
+# Set up logging
+logger = setup_logger(__name__)
+
+def fit_projection(embeddings, n_components, whiten=False):
+    """
+    Fits a PCA projection on a matrix of embeddings using NumPy SVD.
+
+    Args:
+        embeddings (np.ndarray): Array of shape (n_samples, n_features).
+        n_components (int): Number of output dimensions.
+        whiten (bool): If True, scale each component to unit variance.
+
+    Returns:
+        dict: The projection with keys 'mean', 'components', 'scale',
+            'explained_variance_ratio' and 'version'.
+
+    Raises:
+        ValueError: If n_components exceeds the available dimensions.
+    """
+    embeddings = np.asarray(embeddings, dtype=np.float64)
+    n_samples, n_features = embeddings.shape
+    max_components = min(n_samples, n_features)
+    if not 0 < n_components <= max_components:
+        raise ValueError(f"n_components must be between 1 and {max_components}, got {n_components}")
+
+    mean = embeddings.mean(axis=0)
+    _, singular_values, vt = np.linalg.svd(embeddings - mean, full_matrices=False)
+
+    variance = singular_values ** 2 / max(n_samples - 1, 1)
+    explained_variance_ratio = variance / variance.sum()
+    components = vt[:n_components]
+
+    if whiten:
+        scale = 1.0 / np.sqrt(np.maximum(variance[:n_components], np.finfo(np.float64).eps))
+    else:
+        scale = np.ones(n_components)
+
+    # Version the projection by its content so stored vectors can be matched to it
+    digest = hashlib.sha256()
+    for array in (mean, components, scale):
+        digest.update(np.ascontiguousarray(array, dtype=np.float32).tobytes())
+
+    projection = {
+        "mean": mean.astype(np.float32),
+        "components": components.astype(np.float32),
+        "scale": scale.astype(np.float32),
+        "explained_variance_ratio": explained_variance_ratio[:n_components].astype(np.float32),
+        "version": digest.hexdigest()[:12],
+    }
+    logger.info(
+        f"Fitted projection {projection['version']}: {n_features} -> {n_components} dims, "
+        f"explained variance {projection['explained_variance_ratio'].sum():.4f}"
+    )
+    return projection
+
+def apply_projection(embeddings, projection):
+    """
+    Projects embeddings with a fitted projection.
+
+    Works for a single query vector or a matrix of vectors, so catalog and
+    query embeddings go through exactly the same transform.
+
+    Args:
+        embeddings (np.ndarray): Array of shape (n_features,) or (n_samples, n_features).
+        projection (dict): Projection returned by fit_projection or load_projection.
+
+    Returns:
+        np.ndarray: The projected embeddings as float32.
+    """
+    embeddings = np.asarray(embeddings, dtype=np.float32)
+    projected = (embeddings - projection["mean"]) @ projection["components"].T
+    return (projected * projection["scale"]).astype(np.float32)
+
+def save_projection(projection, projection_path):
+    """
+    Saves a projection to an .npz file.
+
+    Args:
+        projection (dict): Projection returned by fit_projection.
+        projection_path (str): Path to save the projection.
+    """
+    directory = os.path.dirname(projection_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    np.savez(projection_path, **projection)
+    logger.info(f"Projection {projection['version']} saved to: {projection_path}")
+
+def load_projection(projection_path):
+    """
+    Loads a projection saved by save_projection.
+
+    Args:
+        projection_path (str): Path to the .npz projection file.
+
+    Returns:
+        dict: The projection.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+    """
+    if not os.path.exists(projection_path):
+        logger.error(f"Projection not found at: {projection_path}")
+        raise FileNotFoundError(f"Projection not found at {projection_path}")
+
+    with np.load(projection_path) as data:
+        projection = {key: data[key] for key in data.files}
+    projection["version"] = str(projection["version"])
+    return projection
+
+def retrieval_recall(full_embeddings, reduced_embeddings, k=10, max_queries=1000, block_size=256, seed=0):
+    """
+    Measures how well reduced vectors preserve cosine nearest neighbours.
+
+    A fixed random sample of embeddings is used as queries against the whole
+    catalog; the result is the mean overlap between the top-k neighbours found
+    with the full and the reduced vectors. Similarities are computed in blocks
+    of queries, so memory grows with block_size * n_samples rather than n_samples ** 2.
+
+    Args:
+        full_embeddings (np.ndarray): Full-dimension embeddings.
+        reduced_embeddings (np.ndarray): Projected embeddings, same row order.
+        k (int): Number of neighbours compared per query.
+        max_queries (int): Maximum number of query rows sampled from the catalog.
+        block_size (int): Number of queries scored at once.
+        seed (int): Seed for the query sample.
+
+    Returns:
+        float: Mean recall@k of the reduced vectors, between 0 and 1.
+    """
+    def normalized(vectors):
+        vectors = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, np.finfo(np.float32).eps)
+
+    def top_k(vectors, rows):
+        similarities = vectors[rows] @ vectors.T
+        similarities[np.arange(len(rows)), rows] = -np.inf  # A query is not its own neighbour
+        return np.argpartition(-similarities, k, axis=1)[:, :k]
+
+    n_samples = len(full_embeddings)
+    k = min(k, n_samples - 1)
+    if k < 1:
+        return 1.0
+
+    full_vectors = normalized(full_embeddings)
+    reduced_vectors = normalized(reduced_embeddings)
+
+    queries = np.arange(n_samples)
+    if n_samples > max_queries:
+        queries = np.sort(np.random.default_rng(seed).choice(n_samples, max_queries, replace=False))
+
+    overlaps = []
+    for start in range(0, len(queries), block_size):
+        rows = queries[start:start + block_size]
+        full_neighbours = top_k(full_vectors, rows)
+        reduced_neighbours = top_k(reduced_vectors, rows)
+        overlaps.extend(
+            len(np.intersect1d(full_row, reduced_row)) / k
+            for full_row, reduced_row in zip(full_neighbours, reduced_neighbours)
+        )
+    return float(np.mean(overlaps))
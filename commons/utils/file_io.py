@@ -1,18 +1,146 @@
 import os
+import glob
+import fnmatch
+from collections import deque
 import pandas as pd
 import logging
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 from commons.utils.logger import setup_logger  # Import the setup_logger function
 
 # Set up the logger
 logger = setup_logger(__name__)
 
-def ingest_data(file_path):
+SUPPORTED_EXTENSIONS = ('.csv', '.xls', '.xlsx', '.json')
+
+# Column added to multi-file ingests with the name of the file each row came from
+SOURCE_COLUMN = "source_file"
+
+def resolve_paths(file_path, exclude=None):
     """
-    Ingests data from a file, automatically detecting the file type.
+    Expands a file, directory or glob pattern into the list of data files to read.
+
+    Directory mode reads every supported file in the directory, so it expects a
+    directory holding only source files. Use a glob pattern such as
+    "data/shards/*.csv", or exclude, to leave other files out.
+
+    Args:
+        file_path (str): A file path, a directory or a glob pattern (e.g. "data/*.csv").
+        exclude (list, optional): File name patterns (e.g. "cleaned_*.csv") to skip
+            in directory and glob mode.
+
+    Returns:
+        list: Sorted paths of the matching data files.
+
+    Raises:
+        FileNotFoundError: If nothing matches.
+    """
+    if os.path.isdir(file_path):
+        paths = [
+            os.path.join(file_path, name) for name in os.listdir(file_path)
+            if os.path.splitext(name)[1].lower() in SUPPORTED_EXTENSIONS
+        ]
+    elif glob.has_magic(file_path):
+        paths = [path for path in glob.glob(file_path) if os.path.isfile(path)]
+    else:
+        paths = [file_path] if os.path.exists(file_path) else []
+        exclude = None  # An explicitly named file is always read
+
+    if exclude:
+        paths = [
+            path for path in paths
+            if not any(fnmatch.fnmatch(os.path.basename(path), pattern) for pattern in exclude)
+        ]
+
+    if not paths:
+        logger.error(f"File not found at: {file_path}")
+        raise FileNotFoundError(f"File not found at {file_path}")
+    return sorted(paths)
+
+def read_file(file_path):
+    """
+    Reads a single data file, automatically detecting the file type.
 
     Args:
         file_path (str): The path to the data file.
 
+    Returns:
+        pd.DataFrame: The file contents.
+
+    Raises:
+        ValueError: If the file type is not supported.
+    """
+    file_extension = os.path.splitext(file_path)[1].lower()
+
+    if file_extension == '.csv':
+        return pd.read_csv(file_path)
+    elif file_extension in ('.xls', '.xlsx'):
+        return pd.read_excel(file_path)
+    elif file_extension == '.json':
+        return pd.read_json(file_path)
+    else:
+        raise ValueError(f"Unsupported file type: {file_extension}")
+
+def ingest_chunks(file_path, max_workers=None, use_processes=False, exclude=None):
+    """
+    Reads every file matched by a path concurrently and yields one DataFrame per file.
+
+    Each chunk is tagged with its source file in the SOURCE_COLUMN column.
+    Chunks are yielded in sorted path order. At most max_workers files are
+    read ahead of the caller, so memory stays bounded however many files match.
+
+    Args:
+        file_path (str): A file path, a directory or a glob pattern.
+        max_workers (int, optional): Size of the worker pool and of the read-ahead
+            window. Defaults to the number of CPUs.
+        use_processes (bool): Read on a process pool instead of a thread pool.
+        exclude (list, optional): File name patterns to skip (see resolve_paths).
+
+    Yields:
+        pd.DataFrame: The contents of one file.
+
+    Raises:
+        ValueError: If a file type is not supported.
+        FileNotFoundError: If nothing matches the path.
+        pd.errors.ParserError: If there is an issue parsing a data file.
+    """
+    paths = resolve_paths(file_path, exclude)
+    logger.info(f"Reading {len(paths)} file(s) from: {file_path}")
+
+    max_workers = max_workers or os.cpu_count() or 1
+    executor_class = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+    with executor_class(max_workers=max_workers) as executor:
+        pending = deque()
+        remaining = iter(paths)
+        for path in remaining:
+            pending.append((path, executor.submit(read_file, path)))
+            if len(pending) >= max_workers:
+                break
+
+        while pending:
+            path, future = pending.popleft()
+            df = future.result()
+            next_path = next(remaining, None)
+            if next_path is not None:
+                pending.append((next_path, executor.submit(read_file, next_path)))
+            df[SOURCE_COLUMN] = os.path.basename(path)
+            yield df
+
+def ingest_data(file_path, max_workers=None, use_processes=False, as_chunks=False, exclude=None):
+    """
+    Ingests data from a file, a directory or a glob pattern, automatically detecting the file type.
+
+    A single file is returned as-is. Multiple files are read concurrently,
+    tagged with their source file and combined on the union of their columns.
+
+    Args:
+        file_path (str): The path to the data file, a directory or a glob pattern.
+        max_workers (int, optional): Size of the worker pool for multi-file ingests.
+        use_processes (bool): Read on a process pool instead of a thread pool.
+        as_chunks (bool): If True, return an iterator of per-file DataFrames
+            (see ingest_chunks) instead of a single DataFrame.
+        exclude (list, optional): File name patterns to skip in directory and glob
+            mode (see resolve_paths).
+
     Returns:
         pd.DataFrame: A Pandas DataFrame containing the ingested data.
 
@@ -23,21 +151,20 @@ def ingest_data(file_path):
     """
     logger.info(f"Starting data ingestion from: {file_path}")
 
-    if not os.path.exists(file_path):
-        logger.error(f"File not found at: {file_path}")
-        raise FileNotFoundError(f"File not found at {file_path}")
+    if as_chunks:
+        return ingest_chunks(file_path, max_workers, use_processes, exclude)
 
     try:
-        file_extension = os.path.splitext(file_path)[1].lower()
-
-        if file_extension == '.csv':
-            df = pd.read_csv(file_path)
-        elif file_extension in ('.xls', '.xlsx'):
-            df = pd.read_excel(file_path)
-        elif file_extension == '.json':
-            df = pd.read_json(file_path)
+        paths = resolve_paths(file_path, exclude)
+
+        if len(paths) == 1 and paths[0] == file_path:
+            df = read_file(file_path)
         else:
-            raise ValueError(f"Unsupported file type: {file_extension}")
+            chunks = list(ingest_chunks(file_path, max_workers, use_processes, exclude))
+            columns = [set(chunk.columns) for chunk in chunks]
+            if any(cols != columns[0] for cols in columns):
+                logger.warning("Files have differing columns; missing values are filled with NaN.")
+            df = pd.concat(chunks, ignore_index=True, sort=False)
 
         logger.info(f"Data ingested successfully with shape: {df.shape}")
         return df
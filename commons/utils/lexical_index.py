@@ -0,0 +1,289 @@
+import json
+import os
+import re
+from collections import defaultdict
+from commons.utils.logger import setup_logger
+
+# Set up logging
+logger = setup_logger(__name__)
+
+# Catalog columns holding allergen and source names
+DEFAULT_INDEX_COLUMNS = ["Allergen", "CommonName", "BiochemicalName"]
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+# Score of a token match that covers a whole name; partial (unique) token matches score lower
+TOKEN_MATCH_SCORE = 0.9
+
+# Roman numerals used as allergen designations ("chitinase iii", "type ii")
+ROMAN_NUMERALS = {"ii", "iii", "iv", "vi", "vii", "viii", "ix", "xi", "xii"}
+
+# Tokens within a group change the meaning of a name ("low" vs "high molecular weight glutenin")
+CONTRASTING_TOKENS = [
+    {"low", "high"},
+    {"light", "heavy"},
+    {"major", "minor"},
+    {"acidic", "basic"},
+    {"alpha", "beta", "gamma", "delta", "epsilon", "kappa", "omega"},
+]
+
+def normalize(text):
+    """Lowercases text and collapses it to space-separated alphanumeric tokens."""
+    return " ".join(_TOKEN_PATTERN.findall(str(text).lower()))
+
+def designation_tokens(tokens):
+    """
+    Returns the tokens that identify a specific allergen rather than describe it.
+
+    These are tokens containing a digit, single-letter tokens and roman numerals,
+    e.g. "h" and "10" in "ara h 10", "2s" in "2s albumin" or "iii" in "chitinase iii".
+    """
+    return {
+        token for token in tokens
+        if len(token) == 1 or token in ROMAN_NUMERALS or any(char.isdigit() for char in token)
+    }
+
+def compatible_names(query_tokens, name_tokens):
+    """
+    Checks that a non-exact match cannot point at a different allergen.
+
+    Designation tokens must be identical, and the names must not differ within
+    a group of contrasting tokens.
+
+    Args:
+        query_tokens (set): Tokens of the normalized query.
+        name_tokens (set): Tokens of the normalized candidate name.
+
+    Returns:
+        bool: True if the candidate may be accepted.
+    """
+    if designation_tokens(query_tokens) != designation_tokens(name_tokens):
+        return False
+    for group in CONTRASTING_TOKENS:
+        query_group, name_group = query_tokens & group, name_tokens & group
+        if query_group and name_group and query_group != name_group:
+            return False
+    return True
+
+def char_ngrams(text, n=3):
+    """Returns the set of character n-grams of a normalized, space-padded string."""
+    padded = f" {text} "
+    if len(padded) <= n:
+        return {padded}
+    return {padded[i:i + n] for i in range(len(padded) - n + 1)}
+
+class LexicalIndex:
+    def __init__(self, ngram_size=3):
+        """Initialize an empty inverted index over allergen names."""
+        self.ngram_size = ngram_size
+        self.names = []            # normalized names, position is the name id
+        self.name_ids = {}         # normalized name -> name id
+        self.postings = []         # name id -> list of [doc_id, field]
+        self.ngram_counts = []     # name id -> number of distinct n-grams
+        self.token_index = defaultdict(set)   # token -> name ids
+        self.ngram_index = defaultdict(set)   # character n-gram -> name ids
+
+    @classmethod
+    def build(cls, df, columns=None, ngram_size=3):
+        """
+        Builds the index from catalog columns of a DataFrame.
+
+        Document ids are row positions as strings, matching the '_id' used when
+        embeddings are published.
+
+        Args:
+            df (pd.DataFrame): The catalog DataFrame.
+            columns (list, optional): Columns to index. Defaults to DEFAULT_INDEX_COLUMNS;
+                columns missing from the DataFrame are skipped.
+            ngram_size (int): Character n-gram length used for fuzzy matching.
+
+        Returns:
+            LexicalIndex: The populated index.
+        """
+        columns = columns or DEFAULT_INDEX_COLUMNS
+        present = [col for col in columns if col in df.columns]
+        missing = [col for col in columns if col not in df.columns]
+        if missing:
+            logger.warning(f"Columns not indexed (missing from data): {missing}")
+
+        index = cls(ngram_size)
+        for position, row in enumerate(df[present].itertuples(index=False)):
+            for field, value in zip(present, row):
+                if value is None or value != value:  # Skip None and NaN
+                    continue
+                index.add(value, str(position), field)
+
+        logger.info(f"Lexical index built over {present}: {len(index.names)} names, "
+                    f"{len(index.token_index)} tokens, {len(index.ngram_index)} n-grams")
+        return index
+
+    def add(self, name, doc_id, field):
+        """Adds a name occurrence for a document to the index."""
+        normalized = normalize(name)
+        if not normalized:
+            return
+
+        name_id = self.name_ids.get(normalized)
+        if name_id is None:
+            name_id = len(self.names)
+            self.names.append(normalized)
+            self.name_ids[normalized] = name_id
+            self.postings.append([])
+            ngrams = char_ngrams(normalized, self.ngram_size)
+            self.ngram_counts.append(len(ngrams))
+            for token in normalized.split():
+                self.token_index[token].add(name_id)
+            for ngram in ngrams:
+                self.ngram_index[ngram].add(name_id)
+
+        if [doc_id, field] not in self.postings[name_id]:
+            self.postings[name_id].append([doc_id, field])
+
+    def lookup(self, query, min_score=0.8):
+        """
+        Finds catalog documents whose names match a query.
+
+        Tries, in order: an exact name match, a token match and a fuzzy match on
+        character n-gram Dice similarity. A token match needs every query token in
+        the name and either covers all of the name's tokens (e.g. reordered or
+        differently punctuated) or picks out a single name with enough coverage.
+        Token and fuzzy candidates must also pass compatible_names, so "ara h 10"
+        never resolves to "ara h 1".
+
+        Args:
+            query (str): The allergen or source name to look up.
+            min_score (float): Minimum score for token and fuzzy matches.
+
+        Returns:
+            list: Matches as dicts with 'doc_id', 'field', 'name', 'score' and 'match'.
+                Empty if the query is unresolved.
+        """
+        normalized = normalize(query)
+        if not normalized:
+            return []
+
+        name_id = self.name_ids.get(normalized)
+        if name_id is not None:
+            return self._matches({name_id: 1.0}, "exact")
+
+        query_tokens = set(normalized.split())
+        token_sets = [self.token_index.get(token) for token in query_tokens]
+        if all(token_sets):
+            name_ids = {
+                name_id for name_id in set.intersection(*token_sets)
+                if compatible_names(query_tokens, set(self.names[name_id].split()))
+            }
+            covered = {
+                name_id: TOKEN_MATCH_SCORE for name_id in name_ids
+                if set(self.names[name_id].split()) <= query_tokens
+            }
+            if covered:
+                return self._matches(covered, "token")
+            if len(name_ids) == 1:
+                name_id = name_ids.pop()
+                score = TOKEN_MATCH_SCORE * len(query_tokens) / len(set(self.names[name_id].split()))
+                if score >= min_score:
+                    return self._matches({name_id: score}, "token")
+
+        query_ngrams = char_ngrams(normalized, self.ngram_size)
+        overlaps = defaultdict(int)
+        for ngram in query_ngrams:
+            for candidate in self.ngram_index.get(ngram, ()):
+                overlaps[candidate] += 1
+
+        scores = {}
+        for candidate, overlap in overlaps.items():
+            score = 2.0 * overlap / (len(query_ngrams) + self.ngram_counts[candidate])
+            if score >= min_score and compatible_names(query_tokens, set(self.names[candidate].split())):
+                scores[candidate] = score
+        if not scores:
+            return []
+
+        best = max(scores.values())
+        return self._matches({k: v for k, v in scores.items() if v == best}, "fuzzy")
+
+    def resolve(self, queries, min_score=0.8):
+        """
+        Splits queries into those answered by the index and those needing embedding search.
+
+        Args:
+            queries (list): Query strings.
+            min_score (float): Minimum Dice similarity for fuzzy matches.
+
+        Returns:
+            tuple: (dict of query -> matches, list of unresolved queries).
+        """
+        resolved, unresolved = {}, []
+        for query in queries:
+            matches = self.lookup(query, min_score)
+            if matches:
+                resolved[query] = matches
+            else:
+                unresolved.append(query)
+        return resolved, unresolved
+
+    def _matches(self, scored_name_ids, match_type):
+        """Expands scored name ids into per-document matches."""
+        matches = []
+        for name_id, score in sorted(scored_name_ids.items()):
+            for doc_id, field in self.postings[name_id]:
+                matches.append({
+                    "doc_id": doc_id,
+                    "field": field,
+                    "name": self.names[name_id],
+                    "score": score,
+                    "match": match_type,
+                })
+        return matches
+
+    def save(self, index_path):
+        """
+        Saves the index to a JSON file.
+
+        Args:
+            index_path (str): Path to save the index.
+        """
+        directory = os.path.dirname(index_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        data = {
+            "ngram_size": self.ngram_size,
+            "names": self.names,
+            "postings": self.postings,
+            "token_index": {token: sorted(ids) for token, ids in self.token_index.items()},
+            "ngram_index": {ngram: sorted(ids) for ngram, ids in self.ngram_index.items()},
+        }
+        with open(index_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        logger.info(f"Lexical index saved to: {index_path}")
+
+    @classmethod
+    def load(cls, index_path):
+        """
+        Loads an index saved by save.
+
+        Args:
+            index_path (str): Path to the JSON index file.
+
+        Returns:
+            LexicalIndex: The loaded index.
+
+        Raises:
+            FileNotFoundError: If the file does not exist.
+        """
+        if not os.path.exists(index_path):
+            logger.error(f"Lexical index not found at: {index_path}")
+            raise FileNotFoundError(f"Lexical index not found at {index_path}")
+
+        with open(index_path, encoding="utf-8") as f:
+            data = json.load(f)
+
+        index = cls(data["ngram_size"])
+        index.names = data["names"]
+        index.name_ids = {name: name_id for name_id, name in enumerate(index.names)}
+        index.postings = data["postings"]
+        index.ngram_counts = [len(char_ngrams(name, index.ngram_size)) for name in index.names]
+        index.token_index.update({token: set(ids) for token, ids in data["token_index"].items()})
+        index.ngram_index.update({ngram: set(ids) for ngram, ids in data["ngram_index"].items()})
+        return index
@@ -1,5 +1,3 @@
-import pymongo
-from pymongo import MongoClient
 import logging
 
 # Set up logging
@@ -9,6 +7,8 @@ logger = logging.getLogger(__name__)
 class EmbeddingStore:
     def __init__(self, mongo_uri: str, db_name: str):
         """Initialize connection to MongoDB."""
+        from pymongo import MongoClient
+
         self.client = MongoClient(mongo_uri)
         self.db = self.client[db_name]
         logger.info(f"Connected to MongoDB database: {db_name}")